@@ -1,19 +1,426 @@
+"""
+Stage 01: collect raw Hindi corpora from the HF Hub into data/raw/.
+
+Outputs are JSONL (optionally .jsonl.zst) or Parquet, one file per source/kind.
+Read JSONL back with `read_jsonl(path, Schema)`, which decodes each line with
+msgspec straight into a typed Struct (TextRec, ParallelRec, WikipediaRec,
+SummaryRec, IndicRec) instead of building a dict per line via json.loads.
+"""
+import io
 import os
 import json
+import hashlib
+import shutil
 from pathlib import Path
-from typing import Optional, Iterable, Dict, Any
+from typing import Optional, Iterable, Dict, Any, List, Callable, Tuple
+from urllib.parse import quote
 from tqdm import tqdm
 import argparse
+import multiprocessing
+import queue
+import threading
+from itertools import islice
+
+import fsspec.spec
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import zstandard as zstd
+import msgspec
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from datasets import Dataset, load_dataset
+from huggingface_hub import HfApi, HfFileSystem
 
-from datasets import load_dataset
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json
+    orjson = None
 
 RAW_DIR = Path("../data/raw")
+FLUSH_BYTES = 64 * 1024      # flush the in-memory batch once it reaches this size
+WRITE_BUFFER = 1 << 20       # file object buffer size
+FADVISE_EVERY = 256 * 2**20  # drop written pages from the page cache every this many bytes
+ZSTD_LEVEL = 3               # --compress level (also used for Parquet column compression)
+PARQUET_ROWS = 64 * 1024     # rows buffered per Parquet row group (--format parquet)
+ENCODE_BATCH = 1024          # records per task handed to an encoder process
+SHARD_QUEUE = 8              # batches queued per shard writer process (--shards)
+PREFETCH = 8                 # Arrow batches buffered ahead by the prefetch thread
+ARROW_BATCH = 4096           # rows per Arrow batch when iterating HF datasets
+BLOCK_SIZE_MB = 64           # fsspec read block for HF streaming (library default: 5 MiB)
+PARQUET_BATCH = 8192         # rows per Arrow batch when reading parquet shards
+PARQUET_EXPORT = "refs/convert/parquet"  # HF auto-converted parquet branch
+BLOOM_CAPACITY = 1_000_000   # --dedup exact: keys per Bloom filter stage before it grows
+BLOOM_ERROR = 1e-7           # --dedup exact: false-positive rate (unique texts wrongly dropped)
+MINHASH_PERM = 64            # MinHash permutations for --dedup minhash
+MINHASH_THRESHOLD = 0.8      # Jaccard similarity above which texts count as near-duplicates
+# Per-record progress bars: refresh at most once a second / every 10k records,
+# keeping tqdm's clock checks out of the tight encode loop.
+TQDM_RECORDS = dict(mininterval=1.0, miniters=10_000, smoothing=0)
+# All worker processes are spawned, not forked: collectors run on threads (see main),
+# and a child forked from a multi-threaded process can inherit locks held by other
+# threads (prefetch, pyarrow, HTTP) or fail at interpreter shutdown.
+MP_CONTEXT = multiprocessing.get_context("spawn")
+
+def dumps_line(rec: Dict[str, Any]) -> bytes:
+    """Serialize one record to a UTF-8 JSONL line (newline included)."""
+    if orjson is not None:
+        return orjson.dumps(rec, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(rec, ensure_ascii=False) + "\n").encode("utf-8")
+
+def dumps_str(text: str) -> bytes:
+    """Encode a single string as a JSON string literal (quotes included)."""
+    if orjson is not None:
+        return orjson.dumps(text)
+    return json.dumps(text, ensure_ascii=False).encode("utf-8")
+
+def _encode_batch(batch: List[Dict[str, Any]]) -> bytes:
+    """Encode a batch of records into one JSONL blob (runs in worker processes)."""
+    return b"".join(dumps_line(rec) for rec in batch)
+
+def chunked(iterable, size: int):
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+def output_path(path: Path, compress: bool = False) -> Path:
+    return path.with_name(path.name + ".zst") if compress else path
+
+class DropCacheWriter:
+    """
+    Binary file wrapper that periodically tells the kernel it won't need the
+    pages already written (POSIX_FADV_DONTNEED), so multi-GB raw dumps don't
+    evict more useful data (e.g. HF parquet caches) from the page cache.
+    Advice covers the whole file each time: pages still dirty at one call
+    are dropped by a later one once written back.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.pending = 0
+
+    def write(self, data) -> int:
+        n = self.f.write(data)
+        self.pending += len(data)
+        if self.pending >= FADVISE_EVERY:
+            self._advise()
+        return n
+
+    def _advise(self):
+        self.f.flush()
+        os.posix_fadvise(self.f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        self.pending = 0
+
+    def flush(self):
+        self.f.flush()
+
+    def fileno(self) -> int:
+        return self.f.fileno()
+
+    @property
+    def closed(self) -> bool:
+        return self.f.closed
+
+    def close(self):
+        if not self.f.closed:
+            self._advise()
+            self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_output(path: Path, compress: bool = False):
+    """
+    Open `path` for binary writing. With `compress`, writes go through a zstd
+    stream writer (read back with zstd.ZstdDecompressor().stream_reader).
+    Where supported (Linux), written pages are dropped from the page cache as we go.
+    """
+    raw = path.open("wb", buffering=WRITE_BUFFER)
+    if hasattr(os, "posix_fadvise"):
+        raw = DropCacheWriter(raw)
+    if not compress:
+        return raw
+    return zstd.ZstdCompressor(level=ZSTD_LEVEL, threads=-1).stream_writer(raw)
+
+def sink_path(path: Path, fmt: str = "jsonl", compress: bool = False) -> Path:
+    """Final on-disk name for an output declared as `<name>.jsonl`."""
+    if fmt == "parquet":
+        return path.with_suffix(".parquet")
+    return output_path(path, compress)
+
+def part_path(path: Path, k: int) -> Path:
+    """`<stem>.jsonl` -> `<stem>.part{k}.jsonl` (before sink_path applies format/compression)."""
+    return path.with_name(f"{path.stem}.part{k}{path.suffix}")
+
+def output_files(path: Path, fmt: str = "jsonl", compress: bool = False, shards: int = 1) -> List[Path]:
+    """Files actually written for an output declared as `path`."""
+    if shards > 1:
+        return [sink_path(part_path(path, k), fmt, compress) for k in range(shards)]
+    return [sink_path(path, fmt, compress)]
+
+class JsonlSink:
+    """Record-at-a-time JSONL writer (optionally zstd-compressed)."""
+
+    def __init__(self, path: Path, compress: bool = False):
+        self.f = open_output(path, compress)
+
+    def write(self, rec: Dict[str, Any]):
+        self.f.write(dumps_line(rec))
+
+    def write_line(self, line: bytes):
+        """Write an already-encoded JSONL line."""
+        self.f.write(line)
+
+    def close(self):
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ParquetSink:
+    """Buffers records and writes them as zstd-compressed Parquet row groups of PARQUET_ROWS."""
+
+    def __init__(self, path: Path, schema: pa.Schema):
+        self.schema = schema
+        self.rows: List[Dict[str, Any]] = []
+        self.writer = pq.ParquetWriter(path, schema, compression="zstd", compression_level=ZSTD_LEVEL,
+                                       use_dictionary=True)
+
+    def write(self, rec: Dict[str, Any]):
+        self.rows.append(rec)
+        if len(self.rows) >= PARQUET_ROWS:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            self.writer.write_table(pa.Table.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _shard_writer(q, path: Path, fmt: str, schema: Optional[pa.Schema], compress: bool):
+    """Writer process for one output shard: drains batches from `q` until a None sentinel."""
+    with open_sink(path, fmt, schema, compress) as sink:
+        while True:
+            batch = q.get()
+            if batch is None:
+                return
+            for item in batch:
+                if isinstance(item, bytes):
+                    sink.write_line(item)
+                else:
+                    sink.write(item)
+
+class ShardedSink:
+    """
+    Sink that fans records out to `shards` writer processes, each owning one
+    `<stem>.part{k}` file. Batches of ENCODE_BATCH items go round-robin, so
+    encoding, compression and disk writes all run in parallel, and the
+    resulting parts can be read in parallel downstream.
+    Accepts records (write) and, for JSONL, pre-encoded lines (write_line).
+    """
 
-def write_jsonl(path: Path, records: Iterable[Dict[str, Any]], total: Optional[int] = None):
+    def __init__(self, path: Path, shards: int, fmt: str = "jsonl", schema: Optional[pa.Schema] = None,
+                 compress: bool = False):
+        self.buf: List[Any] = []
+        self.k = 0
+        self.queues = [MP_CONTEXT.Queue(maxsize=SHARD_QUEUE) for _ in range(shards)]
+        self.procs = [
+            MP_CONTEXT.Process(target=_shard_writer, args=(q, part_path(path, k), fmt, schema, compress))
+            for k, q in enumerate(self.queues)
+        ]
+        for p in self.procs:
+            p.start()
+
+    def write(self, rec):
+        self.buf.append(rec)
+        if len(self.buf) >= ENCODE_BATCH:
+            self._dispatch()
+
+    write_line = write
+
+    def _put(self, k: int, item):
+        # Bounded queue: never block indefinitely on a writer that has died.
+        while True:
+            try:
+                self.queues[k].put(item, timeout=1.0)
+                return
+            except queue.Full:
+                if not self.procs[k].is_alive():
+                    self._abandon_queues()
+                    raise RuntimeError(
+                        f"Shard writer {k} exited with code {self.procs[k].exitcode}"
+                    ) from None
+
+    def _dispatch(self):
+        self._put(self.k, self.buf)
+        self.buf = []
+        self.k = (self.k + 1) % len(self.queues)
+
+    def close(self):
+        if self.buf:
+            self._dispatch()
+        for k in range(len(self.queues)):
+            self._put(k, None)
+        for p in self.procs:
+            p.join()
+        failed = [p.exitcode for p in self.procs if p.exitcode != 0]
+        if failed:
+            self._abandon_queues()
+            raise RuntimeError(f"Shard writer process(es) failed with exit codes {failed}")
+
+    def _abandon_queues(self):
+        # Batches still buffered for a dead writer can never be delivered; without
+        # cancel_join_thread the queue feeder threads block at interpreter exit.
+        for q in self.queues:
+            q.cancel_join_thread()
+            q.close()
+
+    def terminate(self):
+        self._abandon_queues()
+        for p in self.procs:
+            if p.is_alive():
+                p.terminate()
+            p.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is not None:
+            self.terminate()
+            return
+        try:
+            self.close()
+        except BaseException:
+            self.terminate()
+            raise
+
+def open_sink(path: Path, fmt: str = "jsonl", schema: Optional[pa.Schema] = None, compress: bool = False,
+              shards: int = 1):
+    """
+    Open a record sink for `path` in the requested --format (see `sink_path` for the final name).
+    With shards > 1 the output is split across `<stem>.part{k}` files written by worker processes.
+    """
+    if shards > 1:
+        return ShardedSink(path, shards, fmt, schema, compress)
+    if fmt == "parquet":
+        return ParquetSink(sink_path(path, fmt), schema)
+    return JsonlSink(sink_path(path, fmt, compress), compress)
+
+def write_parquet(path: Path, records: Iterable[Dict[str, Any]], schema: pa.Schema, total: Optional[int] = None,
+                  position: int = 0):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path = sink_path(path, "parquet")
+    with ParquetSink(path, schema) as sink:
+        for rec in tqdm(records, total=total, desc=f"Writing {path.relative_to(RAW_DIR)}", position=position,
+                        **TQDM_RECORDS):
+            sink.write(rec)
+
+def write_sharded(path: Path, records: Iterable[Dict[str, Any]], schema: pa.Schema, shards: int,
+                  fmt: str = "jsonl", total: Optional[int] = None, position: int = 0, compress: bool = False):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with ShardedSink(path, shards, fmt, schema, compress) as sink:
+        desc = f"Writing {path.relative_to(RAW_DIR)} ({shards} shards)"
+        for rec in tqdm(records, total=total, desc=desc, position=position, **TQDM_RECORDS):
+            sink.write(rec)
+
+def write_records(path: Path, records: Iterable[Dict[str, Any]], schema: pa.Schema, fmt: str = "jsonl",
+                  total: Optional[int] = None, num_proc: Optional[int] = None, position: int = 0,
+                  compress: bool = False, shards: int = 1):
+    """
+    Write `records` as JSONL (write_jsonl) or Parquet (write_parquet) depending on `fmt`,
+    or split across `shards` part files (write_sharded).
+    """
+    if shards > 1:
+        write_sharded(path, records, schema, shards, fmt=fmt, total=total, position=position, compress=compress)
+    elif fmt == "parquet":
+        write_parquet(path, records, schema, total=total, position=position)
+    else:
+        write_jsonl(path, records, total=total, num_proc=num_proc, position=position, compress=compress)
+
+def write_jsonl(path: Path, records: Iterable[Dict[str, Any]], total: Optional[int] = None,
+                num_proc: Optional[int] = None,
+                position: int = 0, compress: bool = False):
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        for rec in tqdm(records, total=total, desc=f"Writing {path.relative_to(RAW_DIR)}"):
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    path = output_path(path, compress)
+    records = tqdm(records, total=total, desc=f"Writing {path.relative_to(RAW_DIR)}", position=position,
+                   **TQDM_RECORDS)
+    if num_proc is not None and num_proc > 1:
+        # Records are independent, so encoding fans out across processes;
+        # imap keeps results in input order and the main process only writes.
+        with open_output(path, compress) as f, MP_CONTEXT.Pool(num_proc) as pool:
+            for blob in pool.imap(_encode_batch, chunked(records, ENCODE_BATCH), chunksize=1):
+                f.write(blob)
+        return
+    # Accumulate encoded lines and flush in chunks: far fewer write() calls than one per record.
+    buf = bytearray()
+    with open_output(path, compress) as f:
+        for rec in records:
+            buf += dumps_line(rec)
+            if len(buf) >= FLUSH_BYTES:
+                f.write(buf)
+                buf.clear()
+        if buf:
+            f.write(buf)
+
+# -------------------------
+# Reading outputs back
+# -------------------------
+class TextRec(msgspec.Struct):
+    lang: str
+    text: str
+
+class ParallelRec(msgspec.Struct):
+    src_lang: str
+    tgt_lang: str
+    src: str
+    tgt: str
+
+class WikipediaRec(msgspec.Struct):
+    lang: str
+    text: str
+    title: str
+    url: str
+
+class SummaryRec(msgspec.Struct):
+    lang: str
+    article: str
+    summary: str
+    url: str
+
+class IndicRec(msgspec.Struct):
+    lang: str
+    text: str
+    note: str
+
+def read_jsonl(path: Path, schema: Optional[type] = None):
+    """
+    Yield records from a .jsonl or .jsonl.zst file, decoded as `schema`
+    (a msgspec.Struct above); plain dicts if no schema is given.
+    """
+    dec = msgspec.json.Decoder(schema) if schema is not None else msgspec.json.Decoder()
+    with path.open("rb") as raw:
+        f = io.BufferedReader(zstd.ZstdDecompressor().stream_reader(raw)) if path.suffix == ".zst" else raw
+        for line in f:
+            if line.strip():
+                yield dec.decode(line)
 
 def take(iterable, limit: Optional[int]):
     if limit is None:
@@ -27,51 +434,499 @@ def take(iterable, limit: Optional[int]):
             if n >= limit:
                 break
 
+def set_block_size(mb: int = BLOCK_SIZE_MB):
+    """Larger fsspec blocks mean fewer fetch+decompress round trips per record while streaming."""
+    fsspec.spec.AbstractBufferedFile.DEFAULT_BLOCK_SIZE = mb * 2**20
+
+def prefetch(iterable, n: int = PREFETCH):
+    """
+    Pull from `iterable` on a background thread, keeping up to `n` items queued.
+    HF streaming spends most of its time in network/decompression code that
+    releases the GIL, so downloading overlaps with encoding/writing here.
+    Exceptions raised by the producer are re-raised in the consumer.
+    """
+    q = queue.Queue(maxsize=n)
+    stop = threading.Event()
+    done = object()
+    err = []
+
+    def _put(x) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(x, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _producer():
+        try:
+            for x in iterable:
+                if not _put(x):
+                    return
+        except BaseException as e:
+            err.append(e)
+        finally:
+            _put(done)
+
+    threading.Thread(target=_producer, daemon=True).start()
+    try:
+        while True:
+            x = q.get()
+            if x is done:
+                break
+            yield x
+        if err:
+            raise err[0]
+    finally:
+        # Consumer may stop early (e.g. take(limit)); unblock the producer.
+        stop.set()
+
+def iter_arrow(ds, limit: Optional[int] = None):
+    """Iterate `ds` as Arrow tables of ARROW_BATCH rows (optionally the first `limit` rows), prefetched."""
+    if limit is not None:
+        # Dataset.take is select(range(n)) and raises past the end; IterableDataset.take just stops.
+        ds = ds.take(min(limit, len(ds)) if isinstance(ds, Dataset) else limit)
+    return prefetch(ds.with_format("arrow").iter(batch_size=ARROW_BATCH))
+
+def _trim_nonempty(col):
+    """Vectorized strip(): returns the trimmed column and a mask of non-null, non-empty rows."""
+    col = pc.utf8_trim_whitespace(col)
+    return col, pc.greater(pc.utf8_length(col), 0)
+
+# -------------------------
+# Rerun cache: data/raw/.manifest.json records, per source, the HF dataset revision,
+# the options that shape the output, and the size/mtime of each file written.
+# A source is skipped when all of these still match.
+# -------------------------
+MANIFEST_NAME = ".manifest.json"
+USE_CACHE = True                   # cleared by --no_cache
+_manifest_lock = threading.Lock()  # sources may finish concurrently
+
+def dataset_revision(repo: str, revision: str = "main") -> Optional[str]:
+    """
+    Commit SHA of `revision` of the dataset repo on the Hub, or None if it can't be
+    resolved (e.g. offline). Parquet mode passes the branch it actually reads, which
+    may be the parquet export rather than main.
+    """
+    try:
+        return HfApi().dataset_info(repo, revision=revision).sha
+    except Exception:
+        return None
+
+def _read_manifest() -> Dict[str, Any]:
+    path = RAW_DIR / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+def is_cached(source: str, rev: Optional[str], params: Dict[str, Any], outputs: List[Path]) -> bool:
+    if not USE_CACHE or rev is None:
+        return False
+    with _manifest_lock:
+        entry = _read_manifest().get(source)
+    if not entry or entry.get("rev") != rev or entry.get("params") != params:
+        return False
+    files = entry.get("files", {})
+    for out in outputs:
+        meta = files.get(str(out.relative_to(RAW_DIR)))
+        if meta is None or not out.exists() or out.stat().st_size != meta["size"]:
+            return False
+    print(f"   {source}: cached (revision {rev[:8]}), skipping")
+    return True
+
+def update_manifest(source: str, rev: Optional[str], params: Dict[str, Any], outputs: List[Path]):
+    if rev is None:
+        return
+    with _manifest_lock:
+        manifest = _read_manifest()
+        manifest[source] = {
+            "rev": rev,
+            "params": params,
+            "files": {
+                str(out.relative_to(RAW_DIR)): {"size": out.stat().st_size, "mtime": out.stat().st_mtime}
+                for out in outputs
+            },
+        }
+        path = RAW_DIR / MANIFEST_NAME
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        tmp.replace(path)
+
+# -------------------------
+# On-the-fly deduplication (--dedup)
+#   exact:   Bloom filter over a hash of the text
+#   minhash: MinHash LSH over whitespace tokens (near-duplicates)
+# -------------------------
+def _dedup_key(rec: Dict[str, Any]) -> str:
+    if "text" in rec:
+        return rec["text"]
+    if "article" in rec:
+        return rec["article"]
+    return rec["src"] + "\t" + rec["tgt"]
+
+class Deduper:
+    """Tracks texts seen so far for one output file and flags repeats."""
+
+    def __init__(self, mode: str = "off"):
+        self.mode = mode
+        self.seen = 0
+        self.dropped = 0
+        if mode == "exact":
+            from pybloom_live import ScalableBloomFilter
+            self._bloom = ScalableBloomFilter(initial_capacity=BLOOM_CAPACITY, error_rate=BLOOM_ERROR,
+                                              mode=ScalableBloomFilter.LARGE_SET_GROWTH)
+        elif mode == "minhash":
+            from datasketch import MinHash, MinHashLSH
+            self._minhash = MinHash
+            self._lsh = MinHashLSH(threshold=MINHASH_THRESHOLD, num_perm=MINHASH_PERM)
+
+    def is_dup(self, rec: Dict[str, Any]) -> bool:
+        if self.mode == "off":
+            return False
+        return self.is_dup_text(_dedup_key(rec))
+
+    def is_dup_text(self, text: str) -> bool:
+        if self.mode == "off":
+            return False
+        self.seen += 1
+        if self.mode == "exact":
+            # add() returns True if the key was (probably) already present
+            dup = self._bloom.add(hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest())
+        else:
+            m = self._minhash(num_perm=MINHASH_PERM)
+            m.update_batch([t.encode("utf-8") for t in set(text.split())])
+            dup = bool(self._lsh.query(m))
+            if not dup:
+                self._lsh.insert(str(self.seen), m)
+        self.dropped += dup
+        return dup
+
+def report_dups(name: str, seen: int, dropped: int):
+    if seen:
+        print(f"   {name}: dropped {dropped}/{seen} duplicates ({dropped / seen:.1%})")
+
+# -------------------------
+# Parquet mode: read the dataset's parquet shards directly, one process per shard.
+# Avoids the single-threaded streaming path for full (non-smoke-test) runs.
+# -------------------------
+BatchFn = Callable[[Any], List[Dict[str, Any]]]  # Arrow batch -> records
+
+def _parquet_shards(repo: str, config: Optional[str], split: str = "train") -> Tuple[str, List[str]]:
+    """
+    List the parquet files for `repo`/`config`/`split`.
+    Returns (revision, files). Falls back to the HF parquet export branch for
+    script-based datasets that don't store parquet on main.
+    """
+    api = HfApi()
+    for revision in ("main", PARQUET_EXPORT):
+        try:
+            files = api.list_repo_files(repo, repo_type="dataset", revision=revision)
+        except Exception:
+            continue
+        shards = sorted(
+            f for f in files
+            if f.endswith(".parquet")
+            and (config is None or f"/{config}/" in f"/{f}")
+            and split in f
+        )
+        if shards:
+            return revision, shards
+    raise RuntimeError(f"No parquet shards found for {repo} (config={config}, split={split})")
+
+def _process_shard(task) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """
+    Worker: read one or more parquet shards and write each output's records to its part file.
+    `outputs` is a list of (batch_fn, part_path, schema); every Arrow batch is
+    offered to every batch_fn, so one read of the shard can feed several output files.
+    Only `columns` (those present in the shard) are decoded; None reads them all.
+    Deduplication in this mode is per shard.
+    """
+    repo, revision, filenames, outputs, limit, dedup, fmt, columns, compress = task
+    fs = HfFileSystem()
+    counts = [0] * len(outputs)
+    dedupers = [Deduper(dedup) for _ in outputs]
+    handles = [open_sink(part, fmt, schema, compress) for _, part, schema in outputs]
+    try:
+        for filename in filenames:
+            with fs.open(f"datasets/{repo}@{quote(revision, safe='')}/{filename}", "rb") as src:
+                pf = pq.ParquetFile(src)
+                cols = None if columns is None else [c for c in columns if c in pf.schema_arrow.names]
+                for batch in pf.iter_batches(batch_size=PARQUET_BATCH, columns=cols):
+                    for i, (fn, _, _) in enumerate(outputs):
+                        for rec in fn(batch):
+                            if limit is not None and counts[i] >= limit:
+                                break
+                            if not dedupers[i].is_dup(rec):
+                                handles[i].write(rec)
+                                counts[i] += 1
+                    if limit is not None and all(c >= limit for c in counts):
+                        break
+            if limit is not None and all(c >= limit for c in counts):
+                break
+    finally:
+        for f in handles:
+            f.close()
+    return counts, [(d.seen, d.dropped) for d in dedupers]
+
+def _concat_parquet_parts(parts: List[Path], outpath: Path, schema: pa.Schema, limit: Optional[int]):
+    with pq.ParquetWriter(outpath, schema, compression="zstd", compression_level=ZSTD_LEVEL,
+                          use_dictionary=True) as out:
+        n = 0
+        for part in parts:
+            for batch in pq.ParquetFile(part).iter_batches(batch_size=PARQUET_ROWS):
+                if limit is not None:
+                    batch = batch.slice(0, limit - n)
+                out.write_batch(batch)
+                n += batch.num_rows
+                if limit is not None and n >= limit:
+                    break
+            if limit is not None and n >= limit:
+                break
+    for part in parts:
+        part.unlink(missing_ok=True)
+
+def _concat_parts(parts: List[Path], outpath: Path, limit: Optional[int], compress: bool = False):
+    # Parts are plain JSONL; compression (if any) happens once here, on the merged stream.
+    with open_output(output_path(outpath, compress), compress) as out:
+        n = 0
+        for part in parts:
+            with part.open("rb") as f:
+                if limit is None:
+                    shutil.copyfileobj(f, out)
+                else:
+                    for line in take(f, limit - n):
+                        out.write(line)
+                        n += 1
+            if limit is not None and n >= limit:
+                break
+    for part in parts:
+        part.unlink(missing_ok=True)
+
+def collect_parquet(repo: str, config: Optional[str], outputs: List[Tuple[BatchFn, Path, pa.Schema]],
+                    limit: Optional[int] = None, num_proc: Optional[int] = None, position: int = 0,
+                    dedup: str = "off", compress: bool = False, fmt: str = "jsonl",
+                    columns: Optional[List[str]] = None, shards: int = 1,
+                    shard_list: Optional[Tuple[str, List[str]]] = None):
+    """
+    Parallel ingest: map `_process_shard` over the parquet shards of `repo`/`config`
+    and write `<stem>.part{i}.jsonl` (or `.parquet`) per shard, then concatenate into
+    each output path. `batch_fn`s must be module-level so they can be pickled to the workers.
+    `columns` projects the read so unused fields are never fetched or decoded.
+    `num_proc` readers run at once (default: one per shard, up to the CPU count). Shards
+    are submitted lazily, in order, so with `limit` no new shard is started once every
+    output has enough rows.
+    With shards > 1, input shards are split into that many disjoint groups, one worker
+    per group, and each worker's `<stem>.part{k}` file is kept as a final output shard;
+    `limit` is then split evenly across the parts, so it still caps each output's total.
+    `shard_list` is a (revision, files) pair from `_parquet_shards`, if the caller
+    already listed the shards (e.g. to key the cache on that revision).
+    """
+    revision, files = shard_list or _parquet_shards(repo, config)
+    for _, outpath, _ in outputs:
+        outpath.parent.mkdir(parents=True, exist_ok=True)
+    groups = [files[k::shards] for k in range(shards)] if shards > 1 else [[f] for f in files]
+    def part_limit(k: int) -> Optional[int]:
+        if limit is None or shards <= 1:
+            return limit
+        return limit // shards + (k < limit % shards)
+
+    tasks = [
+        (repo, revision, group,
+         [(fn, part_path(outpath, k), schema) for fn, outpath, schema in outputs],
+         part_limit(k), dedup, fmt, columns, compress and shards > 1)
+        for k, group in enumerate(groups)
+    ]
+    dups = [[0, 0] for _ in outputs]
+    rows = [0] * len(outputs)
+    workers = shards if shards > 1 else num_proc or min(len(tasks), os.cpu_count() or 1)
+
+    def enough() -> bool:
+        # With --shards every part is a final output, so every group has to run.
+        return limit is not None and shards <= 1 and all(n >= limit for n in rows)
+
+    # Spawned workers don't inherit --block_size_mb; hand it over explicitly.
+    block_mb = fsspec.spec.AbstractBufferedFile.DEFAULT_BLOCK_SIZE // 2**20
+    submitted = 0
+    with ProcessPoolExecutor(max_workers=workers, mp_context=MP_CONTEXT, initializer=set_block_size,
+                             initargs=(block_mb,)) as pool, \
+            tqdm(total=len(tasks), desc=f"Shards {repo}", position=position) as pbar:
+        running = set()
+        while True:
+            while len(running) < workers and submitted < len(tasks) and not enough():
+                running.add(pool.submit(_process_shard, tasks[submitted]))
+                submitted += 1
+            if not running:
+                break
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                counts, shard_dups = fut.result()
+                for i, n in enumerate(counts):
+                    rows[i] += n
+                for acc, (seen, dropped) in zip(dups, shard_dups):
+                    acc[0] += seen
+                    acc[1] += dropped
+                pbar.update()
+    # Shards are submitted in order, so the ones that ran are a prefix of `tasks`.
+    tasks = tasks[:submitted]
+    for j, (_, outpath, schema) in enumerate(outputs):
+        parts = [task[3][j][1] for task in tasks]
+        # With --shards the parts are the final outputs; otherwise merge them.
+        if shards <= 1 and fmt == "parquet":
+            _concat_parquet_parts([sink_path(p, fmt) for p in parts], sink_path(outpath, fmt), schema, limit)
+        elif shards <= 1:
+            _concat_parts(parts, outpath, limit, compress=compress)
+        report_dups(str(outpath.relative_to(RAW_DIR)), *dups[j])
+
 # -------------------------
 # Samanantar (parallel en↔hi). In HF config "hi", fields are typically: idx, src, tgt
 # We'll assume src≈English, tgt≈Hindi for the "hi" config (common in this dataset variant).
 # -------------------------
-def collect_samanantar(limit: Optional[int], streaming: bool):
-    ds = load_dataset("ai4bharat/samanantar", "hi", split="train", streaming=streaming)
-    # Parallel file
+SAMANANTAR_PARALLEL_SCHEMA = pa.schema([
+    ("src_lang", pa.string()), ("tgt_lang", pa.string()), ("src", pa.large_string()), ("tgt", pa.large_string()),
+])
+MONO_SCHEMA = pa.schema([("lang", pa.string()), ("text", pa.large_string())])
+SAMANANTAR_COLUMNS = ["src", "tgt"]
+
+def samanantar_parallel_batch(batch):
+    src, has_src = _trim_nonempty(batch["src"])
+    tgt, has_tgt = _trim_nonempty(batch["tgt"])
+    keep = pc.and_(has_src, has_tgt)
+    return [{"src_lang":"en","tgt_lang":"hi","src":s,"tgt":t}
+            for s, t in zip(src.filter(keep).to_pylist(), tgt.filter(keep).to_pylist())]
+
+def samanantar_mono_batch(batch):
+    tgt, keep = _trim_nonempty(batch["tgt"])
+    return [{"lang":"hi","text":t} for t in tgt.filter(keep).to_pylist()]
+
+def _write_samanantar_jsonl(batch, fp, fh, dd_parallel: Deduper, dd_hi: Deduper, counts: List[int],
+                            limit: Optional[int]):
+    """
+    JSONL fast path for the single Samanantar pass: each Hindi sentence is
+    JSON-encoded once and the same bytes are spliced into both the mono line
+    and the parallel line. Key order matches samanantar_*_batch.
+    `counts` is [parallel, mono] records written so far; each file stops at `limit`.
+    """
+    tgt, has_tgt = _trim_nonempty(batch["tgt"])
+    src, has_src = _trim_nonempty(batch["src"])
+    srcs = src.filter(has_tgt).to_pylist()
+    pair = pc.fill_null(has_src.filter(has_tgt), False).to_pylist()
+    for t, s_, ok in zip(tgt.filter(has_tgt).to_pylist(), srcs, pair):
+        t_enc = dumps_str(t)
+        if (limit is None or counts[1] < limit) and not dd_hi.is_dup_text(t):
+            fh.write_line(b'{"lang":"hi","text":' + t_enc + b'}\n')
+            counts[1] += 1
+        if ok and (limit is None or counts[0] < limit) and not dd_parallel.is_dup_text(s_ + "\t" + t):
+            fp.write_line(b'{"src_lang":"en","tgt_lang":"hi","src":' + dumps_str(s_) + b',"tgt":' + t_enc + b'}\n')
+            counts[0] += 1
+
+def collect_samanantar(limit: Optional[int], streaming: bool, num_proc: Optional[int] = None,
+                       mode: str = "stream", position: int = 0, dedup: str = "off", compress: bool = False,
+                       fmt: str = "jsonl", shards: int = 1):
     out_parallel = RAW_DIR / "samanantar" / "en_hi_parallel.jsonl"
-    def gen_parallel():
-        for ex in ds:
-            src = (ex.get("src") or "").strip()
-            tgt = (ex.get("tgt") or "").strip()
-            if src and tgt:
-                yield {"src_lang":"en","tgt_lang":"hi","src":src,"tgt":tgt}
-    write_jsonl(out_parallel, take(gen_parallel(), limit=limit), total=None if streaming else None)
-
-    # Monolingual Hindi (tgt side only)
-    # Reload iterator if streaming, otherwise we can reuse ds
-    ds_hi = load_dataset("ai4bharat/samanantar", "hi", split="train", streaming=streaming)
     out_hi = RAW_DIR / "samanantar" / "hi_mono.jsonl"
-    def gen_hi():
-        for ex in ds_hi:
-            tgt = (ex.get("tgt") or "").strip()
-            if tgt:
-                yield {"lang":"hi","text":tgt}
-    write_jsonl(out_hi, take(gen_hi(), limit=limit), total=None if streaming else None)
+    files = output_files(out_parallel, fmt, compress, shards) + output_files(out_hi, fmt, compress, shards)
+    params = dict(config="hi", mode=mode, limit=limit, dedup=dedup, shards=shards)
+    shard_list = _parquet_shards("ai4bharat/samanantar", "hi") if mode == "parquet" else None
+    rev = dataset_revision("ai4bharat/samanantar", shard_list[0] if shard_list else "main")
+    if is_cached("samanantar", rev, params, files):
+        return
+    if mode == "parquet":
+        collect_parquet("ai4bharat/samanantar", "hi",
+                        [(samanantar_parallel_batch, out_parallel, SAMANANTAR_PARALLEL_SCHEMA),
+                         (samanantar_mono_batch, out_hi, MONO_SCHEMA)],
+                        limit=limit, num_proc=num_proc, position=position, dedup=dedup,
+                        compress=compress, fmt=fmt, columns=SAMANANTAR_COLUMNS, shards=shards,
+                        shard_list=shard_list)
+        update_manifest("samanantar", rev, params, files)
+        return
+
+    # One pass over the dataset feeds both files (the corpus is ~10M rows; don't stream it twice).
+    ds = load_dataset("ai4bharat/samanantar", "hi", split="train", streaming=streaming)
+    ds = ds.select_columns(SAMANANTAR_COLUMNS)
+    out_parallel.parent.mkdir(parents=True, exist_ok=True)
+    dd_parallel, dd_hi = Deduper(dedup), Deduper(dedup)
+    # --limit caps records written per file, as for the other sources.
+    counts = [0, 0]  # parallel, mono
+    with open_sink(out_parallel, fmt, SAMANANTAR_PARALLEL_SCHEMA, compress, shards) as fp, \
+            open_sink(out_hi, fmt, MONO_SCHEMA, compress, shards) as fh, \
+            tqdm(total=limit, desc="Writing samanantar/*", position=position) as pbar:
+        for batch in iter_arrow(ds):
+            written = counts[1]
+            if fmt == "jsonl":
+                _write_samanantar_jsonl(batch, fp, fh, dd_parallel, dd_hi, counts, limit)
+            else:
+                # Monolingual Hindi (tgt side only)
+                for rec in samanantar_mono_batch(batch):
+                    if limit is not None and counts[1] >= limit:
+                        break
+                    if not dd_hi.is_dup(rec):
+                        fh.write(rec)
+                        counts[1] += 1
+                # Parallel file
+                for rec in samanantar_parallel_batch(batch):
+                    if limit is not None and counts[0] >= limit:
+                        break
+                    if not dd_parallel.is_dup(rec):
+                        fp.write(rec)
+                        counts[0] += 1
+            pbar.update(counts[1] - written)
+            if limit is not None and min(counts) >= limit:
+                break
+    report_dups("samanantar/en_hi_parallel.jsonl", dd_parallel.seen, dd_parallel.dropped)
+    report_dups("samanantar/hi_mono.jsonl", dd_hi.seen, dd_hi.dropped)
+    update_manifest("samanantar", rev, params, files)
 
 # -------------------------
 # Wikipedia (Hindi monolingual)
 # HF schema: id, url, title, text
 # -------------------------
-def collect_wikipedia(limit: Optional[int], streaming: bool, snapshot: str = "20231101.hi"):
-    ds = load_dataset("wikimedia/wikipedia", snapshot, split="train", streaming=streaming)
+WIKIPEDIA_SCHEMA = pa.schema([
+    ("lang", pa.string()), ("text", pa.large_string()), ("title", pa.string()), ("url", pa.string()),
+])
+WIKIPEDIA_COLUMNS = ["text", "title", "url"]  # skip 'id'
+
+def wikipedia_batch(batch):
+    text, keep = _trim_nonempty(batch["text"])
+    title = pc.fill_null(batch["title"], "").filter(keep).to_pylist()
+    url = pc.fill_null(batch["url"], "").filter(keep).to_pylist()
+    return [
+        {"lang":"hi", "text": t, "title": ti, "url": u}
+        for t, ti, u in zip(text.filter(keep).to_pylist(), title, url)
+    ]
+
+def collect_wikipedia(limit: Optional[int], streaming: bool, snapshot: str = "20231101.hi",
+                      num_proc: Optional[int] = None, mode: str = "stream", position: int = 0, dedup: str = "off",
+                      compress: bool = False, fmt: str = "jsonl", shards: int = 1):
     outpath = RAW_DIR / "wikipedia" / "hi_mono.jsonl"
+    files = output_files(outpath, fmt, compress, shards)
+    params = dict(config=snapshot, mode=mode, limit=limit, dedup=dedup, shards=shards)
+    shard_list = _parquet_shards("wikimedia/wikipedia", snapshot) if mode == "parquet" else None
+    rev = dataset_revision("wikimedia/wikipedia", shard_list[0] if shard_list else "main")
+    if is_cached("wikipedia", rev, params, files):
+        return
+    if mode == "parquet":
+        collect_parquet("wikimedia/wikipedia", snapshot, [(wikipedia_batch, outpath, WIKIPEDIA_SCHEMA)],
+                        limit=limit, num_proc=num_proc, position=position, dedup=dedup,
+                        compress=compress, fmt=fmt, columns=WIKIPEDIA_COLUMNS, shards=shards,
+                        shard_list=shard_list)
+        update_manifest("wikipedia", rev, params, files)
+        return
+
+    ds = load_dataset("wikimedia/wikipedia", snapshot, split="train", streaming=streaming)
+    ds = ds.select_columns(WIKIPEDIA_COLUMNS)
+    dd = Deduper(dedup)
     def gen():
-        for ex in ds:
-            text = (ex.get("text") or "").strip()
-            if text:
-                yield {
-                    "lang":"hi",
-                    "text": text,
-                    "title": (ex.get("title") or ""),
-                    "url": (ex.get("url") or "")
-                }
-    write_jsonl(outpath, take(gen(), limit=limit), total=None if streaming else None)
+        for batch in iter_arrow(ds):
+            for rec in wikipedia_batch(batch):
+                if not dd.is_dup(rec):
+                    yield rec
+    write_records(outpath, take(gen(), limit=limit), WIKIPEDIA_SCHEMA, fmt=fmt, total=limit,
+                  num_proc=num_proc, position=position, compress=compress, shards=shards)
+    report_dups("wikipedia/hi_mono.jsonl", dd.seen, dd.dropped)
+    update_manifest("wikipedia", rev, params, files)
 
 # -------------------------
 # WikiLingua (Hindi summarization)
@@ -100,21 +955,69 @@ def _to_str(x):
     return None
 
 
-def collect_wikilingua(limit: Optional[int], streaming: bool):
+def wikilingua_record(ex):
+    url = ex.get("url", "")
+
+    # Common field names observed in WikiLingua variants:
+    #   article: Sequence[str] OR {'text': Sequence[str]} OR str
+    #   summary: Sequence[str] OR {'text': Sequence[str]} OR str
+    article = _to_str(ex.get("article"))
+    summary = _to_str(ex.get("summary"))
+
+    # Some mirrors use 'highlights'/'summary_text' instead of 'summary'
+    if not summary:
+        summary = _to_str(ex.get("highlights")) or _to_str(ex.get("summary_text"))
+
+    # Some very minimal mirrors only have 'article'; skip those entries
+    if article and summary:
+        return {"lang": "hi", "article": article, "summary": summary, "url": url}
+    return None
+
+def wikilingua_batch(batch):
+    # Nested/variant schemas: per-row normalisation is simpler than Arrow kernels here.
+    return [rec for rec in map(wikilingua_record, batch.to_pylist()) if rec]
+
+WIKILINGUA_SCHEMA = pa.schema([
+    ("lang", pa.string()), ("article", pa.large_string()), ("summary", pa.large_string()), ("url", pa.string()),
+])
+
+WIKILINGUA_CANDIDATES = [
+    ("wiki_lingua", "hindi"),    # most common
+    ("wikilingua", "hi"),        # some mirrors
+    ("wiki_lingua", "hi"),       # alt spelling
+]
+
+def collect_wikilingua(limit: Optional[int], streaming: bool, num_proc: Optional[int] = None,
+                       mode: str = "stream", position: int = 0, dedup: str = "off", compress: bool = False,
+                       fmt: str = "jsonl", shards: int = 1):
     """
     Collect WikiLingua Hindi summarization pairs.
     Writes: data/raw/wikilingua/hi_sum.jsonl with records:
       {"lang":"hi","article":"...","summary":"...","url":"..."}
     """
+    outpath = RAW_DIR / "wikilingua" / "hi_sum.jsonl"
+    files = output_files(outpath, fmt, compress, shards)
+
     # Try the common builder names/configs in order
     ds = None
     tried = []
-    for builder, config in [
-        ("wiki_lingua", "hindi"),    # most common
-        ("wikilingua", "hi"),        # some mirrors
-        ("wiki_lingua", "hi"),       # alt spelling
-    ]:
+    for builder, config in WIKILINGUA_CANDIDATES:
+        params = dict(builder=builder, config=config, mode=mode, limit=limit, dedup=dedup, shards=shards)
         try:
+            shard_list = _parquet_shards(builder, config) if mode == "parquet" else None
+        except Exception as e:
+            tried.append(f"{builder}/{config}: {e}")
+            continue
+        rev = dataset_revision(builder, shard_list[0] if shard_list else "main")
+        if is_cached("wikilingua", rev, params, files):
+            return
+        try:
+            if mode == "parquet":
+                collect_parquet(builder, config, [(wikilingua_batch, outpath, WIKILINGUA_SCHEMA)],
+                                limit=limit, num_proc=num_proc, position=position, dedup=dedup,
+                                compress=compress, fmt=fmt, shards=shards, shard_list=shard_list)
+                update_manifest("wikilingua", rev, params, files)
+                return
             ds = load_dataset(builder, config, split="train", streaming=streaming)
             break
         except Exception as e:
@@ -126,76 +1029,129 @@ def collect_wikilingua(limit: Optional[int], streaming: bool):
             "Could not load WikiLingua Hindi. Tried:\n  - " + "\n  - ".join(tried)
         )
 
-    outpath = RAW_DIR / "wikilingua" / "hi_sum.jsonl"
-
+    dd = Deduper(dedup)
     def gen():
-        for ex in ds:
-            url = ex.get("url", "")
-
-            # Common field names observed in WikiLingua variants:
-            #   article: Sequence[str] OR {'text': Sequence[str]} OR str
-            #   summary: Sequence[str] OR {'text': Sequence[str]} OR str
-            article = _to_str(ex.get("article"))
-            summary = _to_str(ex.get("summary"))
+        for batch in iter_arrow(ds):
+            for rec in wikilingua_batch(batch):
+                if not dd.is_dup(rec):
+                    yield rec
 
-            # Some mirrors use 'highlights'/'summary_text' instead of 'summary'
-            if not summary:
-                summary = _to_str(ex.get("highlights")) or _to_str(ex.get("summary_text"))
-
-            # Some very minimal mirrors only have 'article'; skip those entries
-            if article and summary:
-                yield {"lang": "hi", "article": article, "summary": summary, "url": url}
-
-    write_jsonl(outpath, take(gen(), limit=limit), total=None if streaming else None)
+    write_records(outpath, take(gen(), limit=limit), WIKILINGUA_SCHEMA, fmt=fmt, total=limit,
+                  num_proc=num_proc, position=position, compress=compress, shards=shards)
+    report_dups("wikilingua/hi_sum.jsonl", dd.seen, dd.dropped)
+    update_manifest("wikilingua", rev, params, files)
 
 # -------------------------
 # Indic LLM corpus (monolingual, mixed Hindi + related languages)
 # Raw dump only; filtering to "true Hindi" should be done in your cleaning stage.
 # -------------------------
-def collect_indicllm(limit: Optional[int], streaming: bool):
-    ds = load_dataset("Hindi-data-hub/odaigen_hindi_pre_trained_sp", split="train", streaming=streaming)
+INDICLLM_SCHEMA = pa.schema([("lang", pa.string()), ("text", pa.large_string()), ("note", pa.string())])
+INDICLLM_COLUMNS = ["text", "content"]  # whichever exist in the shard
+
+def indicllm_batch(batch):
+    # Common fields: 'text' / 'content'
+    names = batch.column_names
+    col = batch["text"] if "text" in names else batch["content"]
+    if "text" in names and "content" in names:
+        col = pc.if_else(pc.greater(pc.utf8_length(pc.fill_null(col, "")), 0), col, batch["content"])
+    txt, keep = _trim_nonempty(col)
+    return [{"lang":"hi_like","text":t,"note":"unfiltered_mixed_hindi_family"} for t in txt.filter(keep).to_pylist()]
+
+def collect_indicllm(limit: Optional[int], streaming: bool, num_proc: Optional[int] = None,
+                     mode: str = "stream", position: int = 0, dedup: str = "off", compress: bool = False,
+                     fmt: str = "jsonl", shards: int = 1):
     outpath = RAW_DIR / "indicllm" / "hi_mixed.jsonl"
+    files = output_files(outpath, fmt, compress, shards)
+    params = dict(mode=mode, limit=limit, dedup=dedup, shards=shards)
+    shard_list = _parquet_shards("Hindi-data-hub/odaigen_hindi_pre_trained_sp", None) if mode == "parquet" else None
+    rev = dataset_revision("Hindi-data-hub/odaigen_hindi_pre_trained_sp", shard_list[0] if shard_list else "main")
+    if is_cached("indicllm", rev, params, files):
+        return
+    if mode == "parquet":
+        collect_parquet("Hindi-data-hub/odaigen_hindi_pre_trained_sp", None,
+                        [(indicllm_batch, outpath, INDICLLM_SCHEMA)],
+                        limit=limit, num_proc=num_proc, position=position, dedup=dedup,
+                        compress=compress, fmt=fmt, columns=INDICLLM_COLUMNS, shards=shards,
+                        shard_list=shard_list)
+        update_manifest("indicllm", rev, params, files)
+        return
+
+    ds = load_dataset("Hindi-data-hub/odaigen_hindi_pre_trained_sp", split="train", streaming=streaming)
+    dd = Deduper(dedup)
     def gen():
-        for ex in ds:
-            # Common fields: 'text' / 'content'
-            txt = ex.get("text") or ex.get("content") or ""
-            txt = txt.strip()
-            if txt:
-                yield {"lang":"hi_like","text":txt,"note":"unfiltered_mixed_hindi_family"}
-    write_jsonl(outpath, take(gen(), limit=limit), total=None if streaming else None)
+        for batch in iter_arrow(ds):
+            for rec in indicllm_batch(batch):
+                if not dd.is_dup(rec):
+                    yield rec
+    write_records(outpath, take(gen(), limit=limit), INDICLLM_SCHEMA, fmt=fmt, total=limit,
+                  num_proc=num_proc, position=position, compress=compress, shards=shards)
+    report_dups("indicllm/hi_mixed.jsonl", dd.seen, dd.dropped)
+    update_manifest("indicllm", rev, params, files)
 
 # -------------------------
 # CLI
 # -------------------------
 def main():
+    global USE_CACHE
     ap = argparse.ArgumentParser()
     ap.add_argument("--no_stream", action="store_true", help="Disable streaming mode (default: streaming enabled).")
-    ap.add_argument("--limit", type=int, default=None, help="Take only N records per file (for smoke tests).")
+    ap.add_argument("--limit", type=int, default=None,
+                    help="Write at most N records per output file, counted after dedup; with --shards, N is "
+                         "the total across that output's parts (for smoke tests).")
     ap.add_argument("--sources", nargs="+", default=["samanantar","wikipedia","wikilingua"],
                     choices=["samanantar","wikipedia","wikilingua","indicllm"],
                     help="Which sources to collect.")
+    ap.add_argument("--num_proc", type=int, default=None,
+                    help="Processes used for JSON encoding (default: 1), or parallel shard readers in parquet "
+                         "mode (default: one per shard, up to the CPU count).")
+    ap.add_argument("--mode", choices=["stream","parquet"], default="stream",
+                    help="stream: HF streaming iterator; parquet: read parquet shards in parallel (full runs).")
+    ap.add_argument("--block_size_mb", type=int, default=BLOCK_SIZE_MB,
+                    help=f"fsspec block size in MiB for streamed reads (default: {BLOCK_SIZE_MB}).")
+    ap.add_argument("--dedup", choices=["off","exact","minhash"], default="off",
+                    help="Drop duplicate texts while collecting: exact (Bloom filter; about "
+                         f"{BLOOM_ERROR:g} of unique texts are dropped as false positives) "
+                         "or minhash (near-dup LSH).")
+    ap.add_argument("--format", choices=["jsonl","parquet"], default="jsonl",
+                    help="Output format: JSONL, or Parquet with zstd column compression.")
+    ap.add_argument("--compress", action="store_true", help="Write zstd-compressed .jsonl.zst files (JSONL only).")
+    ap.add_argument("--shards", type=int, default=1,
+                    help="Split each output into N <name>.partK files written by N worker processes (default: 1).")
+    ap.add_argument("--no_cache", action="store_true",
+                    help=f"Re-collect even if data/raw/{MANIFEST_NAME} says the output is up to date.")
+    ap.add_argument("--serial", action="store_true", help="Collect sources one after another instead of concurrently.")
     args = ap.parse_args()
 
     streaming = not args.no_stream
     limit = args.limit
 
     RAW_DIR.mkdir(parents=True, exist_ok=True)
+    set_block_size(args.block_size_mb)
+    USE_CACHE = not args.no_cache
 
-    if "samanantar" in args.sources:
-        print("→ Collecting Samanantar (en↔hi parallel + hi mono)…")
-        collect_samanantar(limit=limit, streaming=streaming)
-
-    if "wikipedia" in args.sources:
-        print("→ Collecting Wikipedia (hi mono)…")
-        collect_wikipedia(limit=limit, streaming=streaming)
+    collectors = {
+        "samanantar": ("Samanantar (en↔hi parallel + hi mono)", collect_samanantar),
+        "wikipedia": ("Wikipedia (hi mono)", collect_wikipedia),
+        "wikilingua": ("WikiLingua (hi summarization)", collect_wikilingua),
+        "indicllm": ("Indic LLM (raw mixed hi‑family)", collect_indicllm),
+    }
+    tasks = [(name, *collectors[name]) for name in collectors if name in args.sources]
+    kw = dict(limit=limit, streaming=streaming, num_proc=args.num_proc, mode=args.mode, dedup=args.dedup,
+              compress=args.compress, fmt=args.format, shards=args.shards)
 
-    if "wikilingua" in args.sources:
-        print("→ Collecting WikiLingua (hi summarization)…")
-        collect_wikilingua(limit=limit, streaming=streaming)
-
-    if "indicllm" in args.sources:
-        print("→ Collecting Indic LLM (raw mixed hi‑family)…")
-        collect_indicllm(limit=limit, streaming=streaming)
+    if args.serial:
+        for name, label, fn in tasks:
+            print(f"→ Collecting {label}…")
+            fn(**kw)
+    else:
+        # Sources are independent and network-bound: run them side by side,
+        # each with its own progress-bar row.
+        print("→ Collecting " + ", ".join(label for _, label, _ in tasks) + "…")
+        with ThreadPoolExecutor(max_workers=len(tasks)) as ex:
+            futs = {ex.submit(fn, position=i, **kw): name for i, (name, label, fn) in enumerate(tasks)}
+            for f in as_completed(futs):
+                f.result()
+                print(f"✅ {futs[f]} done")
 
     print("✅ Done. Raw files under data/raw/")
 
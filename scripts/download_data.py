@@ -1,10 +1,11 @@
 from datasets import load_dataset
 from pathlib import Path
-from typing import Optional, Iterable
+from typing import Optional, Iterable, Callable
 from tqdm import tqdm
 import json
 import argparse
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 '''
 1. Samanantar
@@ -24,35 +25,63 @@ Samanantar (AI4Bharat)           English-Hindi parallel corpus
 
 '''
 RAW_DIR = Path("../data/raw")
+FLUSH_BYTES = 64 * 1024      # flush the in-memory batch once it reaches this size
+WRITE_BUFFER = 1 << 20       # file object buffer size
 
-def write_jsonl(path: Path, records: Iterable[dict], total: Optional[int] = None):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        for rec in tqdm(records, total=total, desc=f"Writing {path.name}"):
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json
+    orjson = None
 
+def dumps_line(rec: dict) -> bytes:
+    """Serialize one record to a UTF-8 JSONL line (newline included)."""
+    if orjson is not None:
+        return orjson.dumps(rec, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(rec, ensure_ascii=False) + "\n").encode("utf-8")
 
-def normalize_text(x) -> Optional[str]:
+def write_jsonl(path: Path, records: Iterable[dict], total: Optional[int] = None, position: int = 0):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Accumulate encoded lines and flush in chunks: far fewer write() calls than one per record.
+    buf = bytearray()
+    with path.open("wb", buffering=WRITE_BUFFER) as f:
+        for rec in tqdm(records, total=total, desc=f"Writing {path.name}", position=position,
+                        mininterval=1.0, miniters=10_000, smoothing=0):
+            buf += dumps_line(rec)
+            if len(buf) >= FLUSH_BYTES:
+                f.write(buf)
+                buf.clear()
+        if buf:
+            f.write(buf)
+
+
+def make_extractor(field: str, fallback: Optional[str] = None) -> Callable[[dict], Optional[str]]:
     """
-    Normalize a record to plain text string.
-    Returns None if no text is found.
+    Build a text extractor for one source's schema: a single dict lookup
+    (plus `fallback` when the field is empty) instead of probing every known key.
+    HF datasets always yield dicts, so no type checks on the record itself.
     """
-    # Common fields in HF text datasets
-    if isinstance(x, dict):
-        # Wikipedia HF schema
-
-        for k in ("text", "content", "article"):
-            if k in x and isinstance(x[k], str):
-                return x[k].strip()
-        
-        if "tgt" in x and isinstance(x["tgt"], str):
-            return x["tgt"].strip()
-    return None
-
-def iter_text(ds_split, limit: Optional[int] = None):
+    if fallback is None:
+        def _e(x):
+            t = x.get(field)
+            return t.strip() if t else None
+    else:
+        def _e(x):
+            t = x.get(field) or x.get(fallback)
+            return t.strip() if t else None
+    return _e
+
+def _wikilingua_article(x) -> Optional[str]:
+    # 'article' is a nested dict/list in the canonical schema; only plain strings are taken here
+    t = x.get("article")
+    return t.strip() if isinstance(t, str) else None
+
+def iter_text(ds_split, extract: Callable[[dict], Optional[str]], limit: Optional[int] = None):
+    # Deliberately per-record: this is the legacy smoke script (hard-coded
+    # 10-row pulls), so Arrow batching buys nothing here. The batched
+    # Arrow-compute path lives in 01_collect_raw.py (iter_arrow).
     n = 0
     for ex in ds_split:
-        txt = normalize_text(ex)
+        txt = extract(ex)
         if txt:
             yield {"text": txt}
             n += 1
@@ -61,7 +90,7 @@ def iter_text(ds_split, limit: Optional[int] = None):
 
 
 
-def collect_samanantar(limit: Optional[int], streaming: bool):
+def collect_samanantar(limit: Optional[int], streaming: bool, position: int = 0):
     """ Dataset source : https://huggingface.co/datasets/ai4bharat/samanantar
     """
     ds = load_dataset("ai4bharat/samanantar", "hi", split="train", streaming=streaming)
@@ -70,16 +99,16 @@ def collect_samanantar(limit: Optional[int], streaming: bool):
     #     num_rows: 10125706
     # })
     outpath = RAW_DIR / "samanantar_hi.jsonl"
-    write_jsonl(outpath, iter_text(ds, limit=limit), total=None if streaming else (len(ds) if not limit else (min(len(ds), limit))))
+    write_jsonl(outpath, iter_text(ds, make_extractor("tgt"), limit=limit), total=limit, position=position)
 
-def collect_indicLLM(limit: Optional[int], streaming: bool):
+def collect_indicLLM(limit: Optional[int], streaming: bool, position: int = 0):
     """Dataset source : https://arxiv.org/abs/2407.09855 -> https://huggingface.co/datasets/Hindi-data-hub/odaigen_hindi_pre_trained_sp
        Huge dataset but it is a mix of all hindi languages, includes kannauji, marathi, sanskrit, himachali, awadhi, bhili etc...
        TODO : clean this to contain hindi text only, o/w don't include.
     """
     ds = load_dataset("Hindi-data-hub/odaigen_hindi_pre_trained_sp",split="train", streaming=streaming)
     outpath = RAW_DIR / "indicllm_hi.jsonl"
-    write_jsonl(outpath, iter_text(ds, limit=limit), total= None if streaming else (len(ds) if not limit else min(limit, len(ds))))
+    write_jsonl(outpath, iter_text(ds, make_extractor("text", fallback="content"), limit=limit), total=limit, position=position)
 
 
 def collect_OSCAR():
@@ -88,7 +117,7 @@ def collect_OSCAR():
     return
 
 
-def collect_wiki(limit: Optional[int], streaming: bool):
+def collect_wiki(limit: Optional[int], streaming: bool, position: int = 0):
     """ Dataset source : https://huggingface.co/datasets/wikimedia/wikipedia
     """
     ds_wiki = load_dataset("wikimedia/wikipedia", "20231101.hi", split="train", streaming=streaming)
@@ -97,40 +126,50 @@ def collect_wiki(limit: Optional[int], streaming: bool):
     #     num_shards: 2
     # })
     outpath = RAW_DIR / "wikipedia_hi.jsonl"
-    write_jsonl(outpath, iter_text(ds_wiki, limit=limit), total= None if streaming else (len(ds_wiki) if not limit else min(limit, len(ds_wiki))))
+    write_jsonl(outpath, iter_text(ds_wiki, make_extractor("text"), limit=limit), total=limit, position=position)
 
-def collect_wikilingua(limit: Optional[int], streaming: bool):
+def collect_wikilingua(limit: Optional[int], streaming: bool, position: int = 0):
     ds = load_dataset("wiki_lingua", "hindi", split="train", streaming=streaming)
     # Dataset({
     #     features: ['url', 'article'],
     #     num_rows: 3402
     # })
     outpath = RAW_DIR / "wikilingua_hi.jsonl"
-    write_jsonl(outpath, iter_text(ds, limit=limit), total=None if streaming else (len(ds) if not limit else min(limit, len(ds))))
+    write_jsonl(outpath, iter_text(ds, _wikilingua_article, limit=limit), total=limit, position=position)
 
 
 def main():
-
-    print("→ Collecting Samanantar (Hindi side)…")
-    # Collect data from Samanantar
-    collect_samanantar(10, True)
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--serial", action="store_true", help="Collect sources one after another instead of concurrently")
+    args = ap.parse_args()
 
     # # Collect data from mc4
     # collect_mC4()
 
     # # Collect data from OSCAR
     # collect_OSCAR()
-    print(f"→ Collecting Wikipedia…")
-    # Collect data from wiki
-    collect_wiki(10, True)
-
-    # print(f"→ Collecting Indic LLM")
-    # collect_indicLLM(10, True)
-
-    print(f"→ Collecting WikiLingua")
-    collect_wikilingua(10, True)
+    tasks = [
+        ("Samanantar (Hindi side)", collect_samanantar),
+        ("Wikipedia", collect_wiki),
+        # ("Indic LLM", collect_indicLLM),
+        ("WikiLingua", collect_wikilingua),
+    ]
+
+    if args.serial:
+        for label, fn in tasks:
+            print(f"→ Collecting {label}…")
+            fn(10, True)
+    else:
+        # Sources are independent and network-bound: run them side by side,
+        # each with its own progress-bar row.
+        print("→ Collecting " + ", ".join(label for label, _ in tasks) + "…")
+        with ThreadPoolExecutor(max_workers=len(tasks)) as ex:
+            futs = {ex.submit(fn, 10, True, position=i): label for i, (label, fn) in enumerate(tasks)}
+            for f in as_completed(futs):
+                f.result()
+                print(f"✅ {futs[f]} done")
     print("✅ Done. Files are in data/raw/*.jsonl")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
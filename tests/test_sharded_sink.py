@@ -0,0 +1,59 @@
+"""
+ShardedSink failure paths must not hang the interpreter at exit.
+Each scenario runs in a fresh interpreter, so a hang shows up as a timeout.
+"""
+import os
+import subprocess
+import sys
+import textwrap
+import unittest
+import tempfile
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "01_collect_raw.py"
+TIMEOUT = 120
+
+def run_scenario(body: str) -> subprocess.CompletedProcess:
+    with tempfile.TemporaryDirectory() as tmp:
+        # Expose the script under an importable name so spawned writers can unpickle their target.
+        (Path(tmp) / "collect_raw.py").symlink_to(SCRIPT)
+        code = "from pathlib import Path\nimport collect_raw as m\n" + textwrap.dedent(body)
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [tmp, os.environ.get("PYTHONPATH")])))
+        return subprocess.run([sys.executable, "-c", code], cwd=tmp, env=env, timeout=TIMEOUT,
+                              capture_output=True, text=True)
+
+class ShardedSinkFailureTest(unittest.TestCase):
+
+    def test_dead_writer_exits_cleanly(self):
+        # Writers can't open their part files (missing directory), so they die immediately.
+        proc = run_scenario("""
+            try:
+                with m.ShardedSink(Path("missing") / "out.jsonl", 2) as sink:
+                    for i in range(200_000):
+                        sink.write({"lang": "hi", "text": "x" * 64 + str(i)})
+            except RuntimeError as e:
+                assert "Shard writer" in str(e), e
+                print("raised")
+        """)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertIn("raised", proc.stdout)
+
+    def test_failing_producer_exits_cleanly(self):
+        proc = run_scenario("""
+            def records():
+                for i in range(300_000):
+                    if i == 200_000:
+                        raise ValueError("producer failed")
+                    yield {"lang": "hi", "text": "x" * 64 + str(i)}
+            try:
+                with m.ShardedSink(Path("out.jsonl"), 2) as sink:
+                    for rec in records():
+                        sink.write(rec)
+            except ValueError:
+                print("raised")
+        """)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertIn("raised", proc.stdout)
+
+if __name__ == "__main__":
+    unittest.main()